@@ -24,11 +24,12 @@ print(f"URL: {SUPABASE_URL}")
 print(f"Key: {SUPABASE_KEY[:20]}...")
 
 try:
-    # Try to query the jobs table
-    result = supabase.table('jobs').select('*').limit(1).execute()
+    # Try to query the jobs table (HEAD request, no rows are downloaded)
+    result = supabase.table('jobs').select('id', count='exact', head=True).execute()
     print("\n✅ Database is ready!")
     print(f"✅ Table 'jobs' exists")
-    print(f"📊 Current job count: {len(result.data)}")
+    print(f"📊 Current job count: {result.count}")
+    print("ℹ️  Run `python job_stats.py` for counts per source, category and freshness")
     
 except Exception as e:
     error_msg = str(e)
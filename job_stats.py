@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Job stats and health check
+
+Uses the `get_job_stats` RPC, so no job rows are downloaded. Counts are read
+from the trigger-maintained `job_counts` table (supabase/008_job_stats_function.sql),
+so the cost depends on the number of sources and categories, not on the number of jobs.
+
+Usage:
+    python job_stats.py            # counts and freshness per source
+    python job_stats.py --json     # same, as JSON
+    python job_stats.py health     # just check the jobs table is reachable
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from supabase import create_client
+from dotenv import load_dotenv
+
+load_dotenv()
+
+SUPABASE_URL = os.getenv('SUPABASE_URL')
+SUPABASE_KEY = os.getenv('SUPABASE_SERVICE_KEY')
+
+if not SUPABASE_URL or not SUPABASE_KEY:
+    print("❌ Missing SUPABASE_URL or SUPABASE_SERVICE_KEY")
+    sys.exit(1)
+
+supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+
+
+def estimate_jobs() -> int:
+    """Planner estimate of the job count with a HEAD request; only the Content-Range header comes back"""
+    return supabase.table('jobs').select('id', count='planned', head=True).execute().count or 0
+
+
+def format_lag(seconds) -> str:
+    """Format a lag in seconds as a short human readable string"""
+    if seconds is None:
+        return 'n/a'
+    seconds = int(seconds)
+    if seconds < 3600:
+        return f"{seconds // 60}m"
+    if seconds < 86400:
+        return f"{seconds // 3600}h {seconds % 3600 // 60}m"
+    return f"{seconds // 86400}d {seconds % 86400 // 3600}h"
+
+
+def print_stats(stats: dict) -> None:
+    """Print the stats document in a readable layout"""
+    print(f"\n✅ Total jobs: {stats['total']}")
+    print(f"   • Active: {stats['active']}")
+    print(f"   • Inactive: {stats['total'] - stats['active']}")
+
+    by_source = {}
+    by_category = {}
+    for row in stats['counts']:
+        source = by_source.setdefault(row['source'], {'active': 0, 'inactive': 0})
+        source['active' if row['is_active'] else 'inactive'] += row['jobs']
+        if row['is_active']:
+            by_category[row['category']] = by_category.get(row['category'], 0) + row['jobs']
+
+    print("\n📋 Jobs by source (active / inactive):")
+    for source, counts in sorted(by_source.items()):
+        print(f"   • {source}: {counts['active']} / {counts['inactive']}")
+
+    print("\n🏷️  Active jobs by category:")
+    for category, count in sorted(by_category.items(), key=lambda item: -item[1]):
+        print(f"   • {category}: {count}")
+
+    print("\n⏱️  Freshness by source:")
+    for row in stats['freshness']:
+        print(f"   • {row['source']}: newest published {row['newest_published_at']}, "
+              f"last new job {row['last_new_job_at']} ({format_lag(row['seconds_since_new_job'])} ago)")
+
+    print(f"\n⚡ Answered in {stats['elapsed_ms']} ms")
+
+
+def run_stats(as_json: bool) -> None:
+    """Collect counts and freshness from the stats RPC"""
+    started = time.perf_counter()
+
+    stats = supabase.rpc('get_job_stats').execute().data
+    stats['total'] = sum(row['jobs'] for row in stats['counts'])
+    stats['active'] = sum(row['jobs'] for row in stats['counts'] if row['is_active'])
+    stats['elapsed_ms'] = round((time.perf_counter() - started) * 1000)
+
+    if as_json:
+        print(json.dumps(stats, indent=2, default=str))
+    else:
+        print_stats(stats)
+
+
+def run_health() -> None:
+    """Check the jobs table is reachable with a single HEAD request"""
+    started = time.perf_counter()
+    try:
+        total = estimate_jobs()
+    except Exception as e:
+        print(f"❌ Unhealthy: {str(e)}")
+        sys.exit(1)
+
+    elapsed_ms = round((time.perf_counter() - started) * 1000)
+    print(f"✅ Healthy: ~{total} jobs (planner estimate), {elapsed_ms} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Job stats and health check')
+    parser.add_argument('command', nargs='?', default='stats', choices=['stats', 'health'])
+    parser.add_argument('--json', action='store_true', help='Print stats as JSON')
+    args = parser.parse_args()
+
+    if args.command == 'health':
+        run_health()
+    else:
+        if not args.json:
+            print("🔍 Checking jobs in database...")
+        run_stats(args.json)
+
+
+if __name__ == "__main__":
+    main()
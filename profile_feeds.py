@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+Feed latency profiler
+
+Probes every configured job source concurrently over several rounds and
+records DNS / connect / TLS / TTFB / transfer time, payload size, compression
+ratio and parse time, then prints latency percentiles per source as JSON.
+Use it to pick timeouts and concurrency limits for the scraper.
+
+Usage:
+    python profile_feeds.py                         # live sources, 5 rounds
+    python profile_feeds.py --rounds 10 -o out.json
+    python profile_feeds.py --stub                  # local stub server, reproducible
+"""
+
+import gzip
+import json
+import ssl
+import sys
+import time
+import zlib
+import random
+import socket
+import argparse
+import threading
+import http.client
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+USER_AGENT = 'RemoteJobsHub/1.0 (Job Aggregator)'
+
+# (name, url, kind) - keep in sync with the sources in scraper/job_scraper.py
+SOURCES = [
+    ('RemoteOK', 'https://remoteok.com/api', 'json'),
+    ('WWR Programming', 'https://weworkremotely.com/categories/remote-programming-jobs.rss', 'rss'),
+    ('WWR Customer Support', 'https://weworkremotely.com/categories/remote-customer-support-jobs.rss', 'rss'),
+    ('WWR Design', 'https://weworkremotely.com/categories/remote-design-jobs.rss', 'rss'),
+    ('WWR Marketing', 'https://weworkremotely.com/categories/remote-marketing-jobs.rss', 'rss'),
+    ('Remotive', 'https://remotive.com/api/remote-jobs?limit=100', 'json'),
+    ('Remote.co', 'https://remote.co/remote-jobs/developer/feed/', 'rss'),
+]
+
+TIMING_METRICS = ['dns_ms', 'connect_ms', 'tls_ms', 'ttfb_ms', 'transfer_ms', 'total_ms', 'parse_ms']
+SIZE_METRICS = ['wire_bytes', 'body_bytes', 'compression_ratio', 'items']
+PERCENTILES = [50, 90, 95, 99]
+
+MAX_REDIRECTS = 5
+
+
+def _ms(start: float, end: float) -> float:
+    return round((end - start) * 1000, 2)
+
+
+def decode_body(body: bytes, encoding: str) -> bytes:
+    """Undo Content-Encoding so the body can be parsed and its ratio measured"""
+    encoding = (encoding or '').lower()
+    if encoding == 'gzip':
+        return gzip.decompress(body)
+    if encoding == 'deflate':
+        try:
+            return zlib.decompress(body)
+        except zlib.error:
+            return zlib.decompress(body, -zlib.MAX_WBITS)
+    return body
+
+
+def count_items(body: bytes, kind: str) -> int:
+    """Parse a payload the way the scraper does and count its listings"""
+    if kind == 'json':
+        data = json.loads(body)
+        if isinstance(data, dict):
+            data = data.get('jobs', [])
+        # RemoteOK's first element is metadata, not a listing
+        return sum(1 for job in data if isinstance(job, dict) and 'id' in job)
+
+    root = ET.fromstring(body)
+    return len(root.findall('.//item')) + len(root.findall('.//{http://www.w3.org/2005/Atom}entry'))
+
+
+def fetch_once(url: str, timeout: float) -> Tuple[Dict, int, Dict[str, str], bytes]:
+    """Single HTTP GET with every phase timed separately"""
+    parts = urlsplit(url)
+    https = parts.scheme == 'https'
+    host = parts.hostname
+    port = parts.port or (443 if https else 80)
+    path = parts.path or '/'
+    if parts.query:
+        path += '?' + parts.query
+
+    timings = {}
+
+    start = time.perf_counter()
+    addrinfo = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    resolved = time.perf_counter()
+    timings['dns_ms'] = _ms(start, resolved)
+
+    # Try every resolved address in order, like socket.create_connection;
+    # connect_ms includes the failed attempts
+    sock = None
+    last_error: Optional[OSError] = None
+    for family, socktype, proto, _, address in addrinfo:
+        sock = socket.socket(family, socktype, proto)
+        sock.settimeout(timeout)
+        try:
+            sock.connect(address)
+            break
+        except OSError as e:
+            sock.close()
+            sock = None
+            last_error = e
+    if sock is None:
+        raise last_error or OSError(f"no addresses for {host}")
+    connected = time.perf_counter()
+    timings['connect_ms'] = _ms(resolved, connected)
+
+    try:
+        if https:
+            sock = ssl.create_default_context().wrap_socket(sock, server_hostname=host)
+        handshaken = time.perf_counter()
+        timings['tls_ms'] = _ms(connected, handshaken)
+
+        # Hand the already connected socket to http.client so it skips its own connect
+        conn = http.client.HTTPConnection(host, port, timeout=timeout)
+        conn.sock = sock
+        conn.request('GET', path, headers={
+            'Host': parts.netloc,
+            'User-Agent': USER_AGENT,
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'close',
+        })
+        response = conn.getresponse()
+        first_byte = time.perf_counter()
+        timings['ttfb_ms'] = _ms(handshaken, first_byte)
+
+        body = response.read()
+        done = time.perf_counter()
+        timings['transfer_ms'] = _ms(first_byte, done)
+        timings['total_ms'] = _ms(start, done)
+
+        headers = {key.lower(): value for key, value in response.getheaders()}
+        return timings, response.status, headers, body
+    finally:
+        sock.close()
+
+
+def probe(name: str, url: str, kind: str, timeout: float) -> Dict:
+    """Fetch and parse one source, following redirects, and return one sample"""
+    sample = {'source': name, 'url': url, 'redirects': 0}
+
+    try:
+        totals = dict.fromkeys(['dns_ms', 'connect_ms', 'tls_ms', 'ttfb_ms', 'transfer_ms', 'total_ms'], 0.0)
+        current = url
+        while True:
+            timings, status, headers, body = fetch_once(current, timeout)
+            for key, value in timings.items():
+                totals[key] = round(totals[key] + value, 2)
+
+            if status in (301, 302, 303, 307, 308) and 'location' in headers:
+                if sample['redirects'] >= MAX_REDIRECTS:
+                    raise RuntimeError('too many redirects')
+                sample['redirects'] += 1
+                current = urljoin(current, headers['location'])
+                continue
+            break
+
+        sample.update(totals)
+        sample['status'] = status
+        sample['wire_bytes'] = len(body)
+
+        started = time.perf_counter()
+        decoded = decode_body(body, headers.get('content-encoding', ''))
+        sample['body_bytes'] = len(decoded)
+        sample['compression_ratio'] = round(len(decoded) / len(body), 2) if body else None
+
+        if status == 200:
+            sample['items'] = count_items(decoded, kind)
+        sample['parse_ms'] = _ms(started, time.perf_counter())
+
+    except Exception as e:
+        sample['error'] = f"{type(e).__name__}: {str(e)}"
+
+    return sample
+
+
+def percentile(values: List[float], p: float) -> float:
+    """Percentile with linear interpolation between closest ranks"""
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return ordered[0]
+    rank = (len(ordered) - 1) * p / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return round(ordered[low] + (ordered[high] - ordered[low]) * (rank - low), 2)
+
+
+def summarize(values: List[float]) -> Optional[Dict]:
+    values = [value for value in values if value is not None]
+    if not values:
+        return None
+    summary = {f"p{p}": percentile(values, p) for p in PERCENTILES}
+    summary['min'] = round(min(values), 2)
+    summary['max'] = round(max(values), 2)
+    summary['mean'] = round(sum(values) / len(values), 2)
+    return summary
+
+
+def build_report(samples: List[Dict], sources: List[Tuple[str, str, str]], rounds: int,
+                 concurrency: int, stub: bool) -> Dict:
+    """Aggregate samples into per-source percentiles
+
+    Percentiles cover only 200 responses, so fast error pages and redirect
+    loops do not skew them; everything else shows up in status_codes and
+    error_rate.
+    """
+    report = {
+        'generated_at': datetime.now(timezone.utc).isoformat(),
+        'target': 'stub' if stub else 'live',
+        'rounds': rounds,
+        'concurrency': concurrency,
+        'sources': {},
+    }
+
+    for name, url, kind in sources:
+        source_samples = [sample for sample in samples if sample['source'] == name]
+        responded = [sample for sample in source_samples if 'error' not in sample]
+        ok = [sample for sample in responded if sample['status'] == 200]
+        status_codes: Dict[str, int] = {}
+        for sample in responded:
+            status_codes[str(sample['status'])] = status_codes.get(str(sample['status']), 0) + 1
+
+        report['sources'][name] = {
+            'url': url,
+            'kind': kind,
+            'samples': len(source_samples),
+            'ok': len(ok),
+            'errors': len(source_samples) - len(responded),
+            'non_200': len(responded) - len(ok),
+            # Exceptions and non-200 responses both count as failed probes
+            'error_rate': round((len(source_samples) - len(ok)) / len(source_samples), 3) if source_samples else None,
+            'error_messages': sorted({sample['error'] for sample in source_samples if 'error' in sample}),
+            'status_codes': status_codes,
+            'redirects': max((sample['redirects'] for sample in ok), default=0),
+            **{metric: summarize([sample.get(metric) for sample in ok]) for metric in TIMING_METRICS + SIZE_METRICS},
+        }
+
+    return report
+
+
+def run_profile(sources: List[Tuple[str, str, str]], rounds: int, concurrency: int,
+                timeout: float, pause: float) -> List[Dict]:
+    """Probe all sources concurrently, `rounds` times"""
+    samples = []
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for round_number in range(1, rounds + 1):
+            print(f"🔍 Round {round_number}/{rounds}...", file=sys.stderr)
+            futures = [pool.submit(probe, name, url, kind, timeout) for name, url, kind in sources]
+            for future in futures:
+                sample = future.result()
+                sample['round'] = round_number
+                samples.append(sample)
+                if 'error' in sample:
+                    print(f"   ❌ {sample['source']}: {sample['error']}", file=sys.stderr)
+            if pause and round_number < rounds:
+                time.sleep(pause)
+    return samples
+
+
+# --- Local stub server -----------------------------------------------------
+
+# Per-source stub behaviour: (path, kind, items, delay before headers in seconds)
+STUB_ROUTES = {
+    'RemoteOK': ('/api', 'json', 200, 0.15),
+    'WWR Programming': ('/categories/remote-programming-jobs.rss', 'rss', 100, 0.05),
+    'WWR Customer Support': ('/categories/remote-customer-support-jobs.rss', 'rss', 40, 0.05),
+    'WWR Design': ('/categories/remote-design-jobs.rss', 'rss', 40, 0.05),
+    'WWR Marketing': ('/categories/remote-marketing-jobs.rss', 'rss', 40, 0.05),
+    'Remotive': ('/api/remote-jobs', 'json', 100, 0.1),
+    'Remote.co': ('/remote-jobs/developer/feed/', 'rss', 60, 0.2),
+}
+
+
+def _stub_description(rng: random.Random) -> str:
+    words = ['remote', 'python', 'react', 'senior', 'team', 'product', 'design', 'support', 'async', 'global']
+    return ' '.join(rng.choice(words) for _ in range(400))
+
+
+def build_stub_payload(name: str, kind: str, items: int) -> bytes:
+    """Deterministic payload shaped like the real source"""
+    rng = random.Random(name)
+
+    if kind == 'rss':
+        entries = ''.join(
+            f"<item><title>Company {i}: Job {i}</title><link>https://example.com/jobs/{i}</link>"
+            f"<description><![CDATA[<p>{_stub_description(rng)}</p>]]></description>"
+            f"<pubDate>Mon, 01 Jan 2024 00:00:00 +0000</pubDate></item>"
+            for i in range(items)
+        )
+        return f'<?xml version="1.0"?><rss version="2.0"><channel>{entries}</channel></rss>'.encode()
+
+    jobs = [
+        {'id': i, 'position': f'Job {i}', 'title': f'Job {i}', 'company': f'Company {i}',
+         'company_name': f'Company {i}', 'epoch': 1704067200 - i * 60,
+         'tags': ['dev', 'python'], 'description': _stub_description(rng)}
+        for i in range(items)
+    ]
+    if name == 'RemoteOK':
+        return json.dumps([{'legal': 'metadata'}] + jobs).encode()
+    return json.dumps({'job-count': items, 'jobs': jobs}).encode()
+
+
+def start_stub_server() -> Tuple[ThreadingHTTPServer, List[Tuple[str, str, str]]]:
+    """Serve stub payloads on 127.0.0.1 and return the server and matching sources"""
+    routes = {}
+    for name, (path, kind, items, delay) in STUB_ROUTES.items():
+        body = build_stub_payload(name, kind, items)
+        routes[path] = (body, gzip.compress(body, mtime=0), kind, delay)
+
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            route = routes.get(urlsplit(self.path).path)
+            if route is None:
+                self.send_error(404)
+                return
+
+            body, compressed, kind, delay = route
+            time.sleep(delay)
+
+            use_gzip = 'gzip' in self.headers.get('Accept-Encoding', '')
+            payload = compressed if use_gzip else body
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json' if kind == 'json' else 'application/rss+xml')
+            if use_gzip:
+                self.send_header('Content-Encoding', 'gzip')
+            self.send_header('Content-Length', str(len(payload)))
+            self.send_header('Connection', 'close')
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    sources = [(name, base + path, kind) for name, (path, kind, _, _) in STUB_ROUTES.items()]
+    return server, sources
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Profile job source latency and payloads')
+    parser.add_argument('--rounds', type=int, default=5, help='Times every source is probed')
+    parser.add_argument('--concurrency', type=int, default=len(SOURCES), help='Parallel probes')
+    parser.add_argument('--timeout', type=float, default=30, help='Socket timeout in seconds')
+    parser.add_argument('--pause', type=float, default=1.0, help='Seconds between rounds')
+    parser.add_argument('--stub', action='store_true', help='Profile a local stub server instead of the live sources')
+    parser.add_argument('-o', '--output', help='Write the JSON report to this file instead of stdout')
+    args = parser.parse_args()
+
+    server = None
+    sources = SOURCES
+    if args.stub:
+        server, sources = start_stub_server()
+
+    try:
+        samples = run_profile(sources, args.rounds, args.concurrency, args.timeout, args.pause)
+    finally:
+        if server is not None:
+            server.shutdown()
+
+    report = build_report(samples, sources, args.rounds, args.concurrency, args.stub)
+    output = json.dumps(report, indent=2)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+        print(f"✅ Report written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
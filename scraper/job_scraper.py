@@ -13,15 +13,27 @@ Supported Sources:
 import os
 import sys
 import time
+import argparse
 import requests
+import ijson
 from datetime import datetime, timezone, timedelta
-from typing import List, Dict, Optional
+from contextlib import closing
+from io import BytesIO
+from itertools import islice
+from typing import List, Dict, Iterable, Iterator, Optional, Tuple
 from dotenv import load_dotenv
 from supabase import create_client, Client
 from bs4 import BeautifulSoup
 import re
 import xml.etree.ElementTree as ET
 
+from payload_archive import PayloadWriter, archive_payload, iter_manifest, load_payload
+
+try:
+    import orjson
+except ImportError:  # optional, small bodies then go through ijson too
+    orjson = None
+
 # Load environment variables
 load_dotenv()
 
@@ -43,8 +55,36 @@ REMOTECARE_RSS = "https://weworkremotely.com/categories/remote-customer-support-
 WEWORKREMOTELY_DESIGN_RSS = "https://weworkremotely.com/categories/remote-design-jobs.rss"
 WEWORKREMOTELY_MARKETING_RSS = "https://weworkremotely.com/categories/remote-marketing-jobs.rss"
 REMOTIVE_API = "https://remotive.com/api/remote-jobs"
+REMOTIVE_PARAMS = {'limit': 100}  # Get up to 100 jobs
 REMOTE_CO_RSS = "https://remote.co/remote-jobs/developer/feed/"
 
+# Rows per bulk upsert when re-parsing archived payloads
+REPARSE_BATCH_SIZE = 500
+
+# source_ids per existence lookup; keeps `in (...)` filters well under URL length limits
+SOURCE_ID_LOOKUP_BATCH_SIZE = 100
+
+# Max RemoteOK listings read per run
+REMOTEOK_MAX_JOBS = 200
+
+# Bodies up to this many bytes on the wire are parsed in one go with orjson
+SMALL_JSON_BODY_BYTES = 256 * 1024
+
+# Read size when streaming the unparsed rest of a response into the archive
+ARCHIVE_CHUNK_BYTES = 64 * 1024
+
+# Consecutive listings older than the high-water mark before we stop reading;
+# tolerates a few pinned older posts at the top of a feed
+HIGH_WATER_GRACE = 10
+
+# We Work Remotely feeds and the category each one maps to
+WEWORKREMOTELY_FEEDS = {
+    WEWORKREMOTELY_RSS: 'Engineering',
+    REMOTECARE_RSS: 'Customer Support',
+    WEWORKREMOTELY_DESIGN_RSS: 'Design',
+    WEWORKREMOTELY_MARKETING_RSS: 'Marketing',
+}
+
 # Category mapping from source to our categories
 CATEGORY_MAPPING = {
     'dev': 'Engineering',
@@ -138,130 +178,291 @@ def clean_html(html_text: str) -> str:
     return soup.get_text(separator='\n', strip=True)
 
 
-def parse_rss_feed(url: str) -> List[Dict]:
-    """Parse RSS feed using requests and xml.etree"""
+def _archive_quietly(source: str, url: str, content: bytes) -> None:
+    # Archiving must never break a scrape
     try:
-        headers = {'User-Agent': 'RemoteJobsHub/1.0 (Job Aggregator)'}
-        response = requests.get(url, headers=headers, timeout=30)
+        archive_payload(source, url, content)
+    except OSError as e:
+        print(f"⚠️  Could not archive payload from {url}: {str(e)}")
+
+
+def fetch_payload(url: str, source: str, params: Optional[Dict] = None) -> bytes:
+    """Fetch a raw payload and archive it for offline re-parsing"""
+    headers = {'User-Agent': 'RemoteJobsHub/1.0 (Job Aggregator)'}
+    response = requests.get(url, headers=headers, params=params, timeout=30)
+    response.raise_for_status()
+
+    _archive_quietly(source, url, response.content)
+    return response.content
+
+
+def _open_archive_quietly(source: str, url: str) -> Optional[PayloadWriter]:
+    # Archiving must never break a scrape
+    try:
+        return PayloadWriter(source, url)
+    except OSError as e:
+        print(f"⚠️  Could not archive payload from {url}: {str(e)}")
+        return None
+
+
+class _TeeReader:
+    """File-like wrapper that passes every byte read on to a PayloadWriter"""
+
+    def __init__(self, raw, archive: Optional[PayloadWriter]):
+        self.raw = raw
+        self.archive = archive
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self.raw.read(size)
+        if self.archive is not None and chunk:
+            try:
+                self.archive.write(chunk)
+            except OSError as e:
+                self._abort_archive(e)
+        return chunk
+
+    def finish(self) -> None:
+        """Stream the unparsed rest of the body into the archive and store it"""
+        if self.archive is None:
+            return
+        try:
+            while True:
+                chunk = self.raw.read(ARCHIVE_CHUNK_BYTES)
+                if not chunk:
+                    break
+                self.archive.write(chunk)
+            self.archive.close()
+        except Exception as e:
+            # A body cut short by the network is not archived at all
+            self._abort_archive(e)
+        self.archive = None
+
+    def _abort_archive(self, error: Exception) -> None:
+        print(f"⚠️  Could not archive payload from {self.archive.url}: {str(error)}")
+        try:
+            self.archive.abort()
+        except OSError:
+            pass
+        self.archive = None
+
+
+def iter_json_items(fileobj, prefix: str, skip: int = 0) -> Iterator[Dict]:
+    """Incrementally yield the objects under `prefix` (ijson syntax, e.g. 'jobs.item')"""
+    return islice(ijson.items(fileobj, prefix, use_float=True), skip, None)
+
+
+def _select_prefix(data, prefix: str) -> List:
+    """Resolve an ijson-style 'a.b.item' prefix against an already parsed document"""
+    *path, last = prefix.split('.')
+    if last != 'item':
+        raise ValueError(f"Unsupported JSON prefix: {prefix}")
+    for key in path:
+        data = data.get(key, []) if isinstance(data, dict) else []
+    return data if isinstance(data, list) else []
+
+
+def stream_json_items(url: str, source: str, prefix: str, skip: int = 0,
+                      params: Optional[Dict] = None) -> Iterator[Dict]:
+    """Stream a JSON API response and yield one object at a time
+
+    Neither the body nor its object graph is held in memory: items are
+    parsed as bytes arrive, and every chunk read is hashed and compressed
+    into the payload archive right away. Closing the generator early stops
+    parsing; the rest of the body is then streamed into the archive unparsed,
+    so the archived object is always the whole response and identical
+    responses are stored once. If the archive cannot be written, reading
+    stops as soon as the generator is closed. Small bodies (by Content-Length)
+    take an orjson fast path when orjson is installed.
+    """
+    headers = {'User-Agent': 'RemoteJobsHub/1.0 (Job Aggregator)'}
+    response = requests.get(url, headers=headers, params=params, timeout=30, stream=True)
+
+    with closing(response):
         response.raise_for_status()
 
-        # Parse XML
-        root = ET.fromstring(response.content)
-
-        # Find all items in the feed
-        items = []
-        # Try both RSS 2.0 and Atom formats
-        for item in root.findall('.//item'):  # RSS 2.0
-            entry = {}
-            title_elem = item.find('title')
-            link_elem = item.find('link')
-            desc_elem = item.find('description')
-            pubdate_elem = item.find('pubDate')
-
-            entry['title'] = title_elem.text if title_elem is not None else ''
-            entry['link'] = link_elem.text if link_elem is not None else ''
-            entry['description'] = desc_elem.text if desc_elem is not None else ''
-            entry['pubDate'] = pubdate_elem.text if pubdate_elem is not None else ''
-
-            items.append(entry)
-
-        # Also try Atom format
-        for entry_elem in root.findall('.//{http://www.w3.org/2005/Atom}entry'):
-            entry = {}
-            title_elem = entry_elem.find('{http://www.w3.org/2005/Atom}title')
-            link_elem = entry_elem.find('{http://www.w3.org/2005/Atom}link')
-            content_elem = entry_elem.find('{http://www.w3.org/2005/Atom}content')
-
-            entry['title'] = title_elem.text if title_elem is not None else ''
-            entry['link'] = link_elem.get('href', '') if link_elem is not None else ''
-            entry['description'] = content_elem.text if content_elem is not None else ''
-            entry['pubDate'] = ''
-
-            items.append(entry)
-
-        return items
+        content_length = int(response.headers.get('Content-Length') or 0)
+        if orjson is not None and 0 < content_length <= SMALL_JSON_BODY_BYTES:
+            content = response.content
+            try:
+                yield from islice(_select_prefix(orjson.loads(content), prefix), skip, None)
+            finally:
+                _archive_quietly(source, url, content)
+            return
+
+        response.raw.decode_content = True
+        reader = _TeeReader(response.raw, _open_archive_quietly(source, url))
+        try:
+            yield from iter_json_items(reader, prefix, skip)
+        finally:
+            reader.finish()
+
+
+def parse_iso_datetime(value: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO timestamp, treating naive values as UTC"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def get_high_water_mark(source: str) -> Optional[datetime]:
+    """Newest published_at already stored for a source"""
+    try:
+        response = supabase.table('jobs').select('published_at').eq('source', source) \
+            .order('published_at', desc=True).limit(1).execute()
+    except Exception as e:
+        print(f"⚠️  Could not read high-water mark for {source}: {str(e)}")
+        return None
+
+    if not response.data:
+        return None
+    return parse_iso_datetime(response.data[0]['published_at'])
+
+
+def parse_rss_content(content: bytes) -> List[Dict]:
+    """Parse raw RSS 2.0 / Atom XML into entries using xml.etree"""
+    root = ET.fromstring(content)
+
+    # Find all items in the feed
+    items = []
+    # Try both RSS 2.0 and Atom formats
+    for item in root.findall('.//item'):  # RSS 2.0
+        entry = {}
+        title_elem = item.find('title')
+        link_elem = item.find('link')
+        desc_elem = item.find('description')
+        pubdate_elem = item.find('pubDate')
+
+        entry['title'] = title_elem.text if title_elem is not None else ''
+        entry['link'] = link_elem.text if link_elem is not None else ''
+        entry['description'] = desc_elem.text if desc_elem is not None else ''
+        entry['pubDate'] = pubdate_elem.text if pubdate_elem is not None else ''
+
+        items.append(entry)
+
+    # Also try Atom format
+    for entry_elem in root.findall('.//{http://www.w3.org/2005/Atom}entry'):
+        entry = {}
+        title_elem = entry_elem.find('{http://www.w3.org/2005/Atom}title')
+        link_elem = entry_elem.find('{http://www.w3.org/2005/Atom}link')
+        content_elem = entry_elem.find('{http://www.w3.org/2005/Atom}content')
+
+        entry['title'] = title_elem.text if title_elem is not None else ''
+        entry['link'] = link_elem.get('href', '') if link_elem is not None else ''
+        entry['description'] = content_elem.text if content_elem is not None else ''
+        entry['pubDate'] = ''
+
+        items.append(entry)
+
+    return items
+
+
+def parse_rss_feed(url: str, source: str) -> List[Dict]:
+    """Fetch and parse an RSS feed"""
+    try:
+        return parse_rss_content(fetch_payload(url, source))
     except Exception as e:
         print(f"Error parsing RSS feed {url}: {str(e)}")
         return []
 
 
+def parse_remoteok(items: Iterable[Dict], fetched_at: Optional[datetime] = None,
+                   high_water: Optional[datetime] = None) -> List[Dict]:
+    """Normalize RemoteOK listings (metadata element already skipped) into job objects
+
+    Stops pulling from `items` once REMOTEOK_MAX_JOBS listings were read or the
+    feed has gone past `high_water`, so a streamed response is not read further.
+    """
+    jobs = []
+    older_in_a_row = 0
+    for job in islice(items, REMOTEOK_MAX_JOBS):
+        try:
+            # Parse date
+            epoch = job.get('epoch', job.get('date'))
+            if epoch:
+                published = datetime.fromtimestamp(int(epoch), tz=timezone.utc)
+            else:
+                published = fetched_at or datetime.now(timezone.utc)
+
+            # Stop once we are past what the previous run already stored; listings
+            # sharing the high-water timestamp may be new, insert_jobs skips duplicates
+            if high_water and published < high_water:
+                older_in_a_row += 1
+                if older_in_a_row >= HIGH_WATER_GRACE:
+                    break
+                continue
+            older_in_a_row = 0
+
+            # Skip if missing required fields
+            if not job.get('id') or not job.get('position') or not job.get('company'):
+                continue
+
+            # Parse tags
+            tags = job.get('tags', [])
+            if isinstance(tags, list):
+                # Filter out empty tags and limit to 10
+                tags = [tag for tag in tags if tag][:10]
+            else:
+                tags = []
+
+            # Determine category from tags
+            category = normalize_category(tags)
+
+            # Parse salary if available
+            salary_min = None
+            salary_max = None
+            if job.get('salary_min'):
+                salary_min = int(job.get('salary_min'))
+            if job.get('salary_max'):
+                salary_max = int(job.get('salary_max'))
+
+            published_at = published.isoformat()
+
+            # Build job object
+            job_obj = {
+                'title': job.get('position', 'Untitled'),
+                'company': job.get('company', 'Unknown Company'),
+                'description': job.get('description', 'No description provided.'),
+                'requirements': None,  # RemoteOK doesn't separate requirements
+                'location': job.get('location', 'Worldwide'),
+                'job_type': normalize_job_type(job.get('type', '')),
+                'category': category,
+                'tags': tags,
+                'salary_min': salary_min,
+                'salary_max': salary_max,
+                'salary_currency': 'USD',
+                'apply_url': job.get('url', job.get('apply_url', f"https://remoteok.com/remote-jobs/{job.get('id')}")),
+                'company_url': job.get('company_url'),
+                'company_logo_url': job.get('logo'),
+                'source': 'RemoteOK',
+                'source_id': str(job.get('id')),
+                'published_at': published_at,
+                'is_featured': False,
+                'is_active': True,
+            }
+
+            jobs.append(job_obj)
+
+        except Exception as e:
+            print(f"⚠️  Error parsing job {job.get('id')}: {str(e)}")
+            continue
+
+    return jobs
+
+
 def scrape_remoteok() -> List[Dict]:
     """Scrape jobs from RemoteOK API"""
     print("\n🔍 Scraping RemoteOK...")
 
     try:
-        headers = {
-            'User-Agent': 'RemoteJobsHub/1.0 (Job Aggregator)'
-        }
-        response = requests.get(REMOTEOK_API, headers=headers, timeout=30)
-        response.raise_for_status()
-
-        data = response.json()
+        high_water = get_high_water_mark('RemoteOK')
 
         # Skip first item (it's metadata)
-        jobs_data = data[1:] if len(data) > 1 else []
-
-        jobs = []
-        for job in jobs_data[:200]:  # Increased from 50 to 200
-            try:
-                # Skip if missing required fields
-                if not job.get('id') or not job.get('position') or not job.get('company'):
-                    continue
-
-                # Parse tags
-                tags = job.get('tags', [])
-                if isinstance(tags, list):
-                    # Filter out empty tags and limit to 10
-                    tags = [tag for tag in tags if tag][:10]
-                else:
-                    tags = []
-
-                # Determine category from tags
-                category = normalize_category(tags)
-
-                # Parse salary if available
-                salary_min = None
-                salary_max = None
-                if job.get('salary_min'):
-                    salary_min = int(job.get('salary_min'))
-                if job.get('salary_max'):
-                    salary_max = int(job.get('salary_max'))
-
-                # Parse date
-                epoch = job.get('epoch', job.get('date'))
-                if epoch:
-                    published_at = datetime.fromtimestamp(int(epoch), tz=timezone.utc).isoformat()
-                else:
-                    published_at = datetime.now(timezone.utc).isoformat()
-
-                # Build job object
-                job_obj = {
-                    'title': job.get('position', 'Untitled'),
-                    'company': job.get('company', 'Unknown Company'),
-                    'description': job.get('description', 'No description provided.'),
-                    'requirements': None,  # RemoteOK doesn't separate requirements
-                    'location': job.get('location', 'Worldwide'),
-                    'job_type': normalize_job_type(job.get('type', '')),
-                    'category': category,
-                    'tags': tags,
-                    'salary_min': salary_min,
-                    'salary_max': salary_max,
-                    'salary_currency': 'USD',
-                    'apply_url': job.get('url', job.get('apply_url', f"https://remoteok.com/remote-jobs/{job.get('id')}")),
-                    'company_url': job.get('company_url'),
-                    'company_logo_url': job.get('logo'),
-                    'source': 'RemoteOK',
-                    'source_id': str(job.get('id')),
-                    'published_at': published_at,
-                    'is_featured': False,
-                    'is_active': True,
-                }
-
-                jobs.append(job_obj)
-
-            except Exception as e:
-                print(f"⚠️  Error parsing job {job.get('id')}: {str(e)}")
-                continue
+        with closing(stream_json_items(REMOTEOK_API, 'RemoteOK', 'item', skip=1)) as items:
+            jobs = parse_remoteok(items, high_water=high_water)
 
         print(f"✅ Found {len(jobs)} jobs from RemoteOK")
         return jobs
@@ -274,77 +475,158 @@ def scrape_remoteok() -> List[Dict]:
         return []
 
 
+def parse_weworkremotely_entries(entries: List[Dict], default_category: str,
+                                 fetched_at: Optional[datetime] = None) -> List[Dict]:
+    """Normalize We Work Remotely RSS entries into job objects"""
+    jobs = []
+
+    for entry in entries[:50]:  # 50 per category
+        try:
+            # Extract job details
+            title = entry.get('title', 'Untitled')
+            link = entry.get('link', '')
+
+            # Parse description
+            description = clean_html(entry.get('description', ''))
+
+            # Extract company from title (usually format: "Company: Job Title")
+            company = 'Unknown Company'
+            if ':' in title:
+                parts = title.split(':', 1)
+                company = parts[0].strip()
+                title = parts[1].strip() if len(parts) > 1 else title
+
+            # Parse published date
+            published_at = (fetched_at or datetime.now(timezone.utc)).isoformat()
+
+            # Generate unique ID from link
+            source_id = link.split('/')[-1] if link else str(hash(title + company))
+
+            # Extract salary from description
+            salary_min, salary_max, currency = extract_salary_from_text(description)
+
+            job_obj = {
+                'title': title,
+                'company': company,
+                'description': description[:5000],  # Limit length
+                'location': 'Worldwide',
+                'job_type': 'Full-time',
+                'category': default_category,
+                'tags': [default_category.lower()],
+                'salary_min': salary_min,
+                'salary_max': salary_max,
+                'salary_currency': currency,
+                'apply_url': link,
+                'source': 'WeWorkRemotely',
+                'source_id': source_id,
+                'published_at': published_at,
+                'remote_type': 'fully-remote',
+                'is_active': True,
+            }
+
+            jobs.append(job_obj)
+
+        except Exception as e:
+            print(f"⚠️  Error parsing WWR entry: {str(e)}")
+            continue
+
+    return jobs
+
+
+def scrape_weworkremotely_feed(feed_url: str, default_category: str) -> List[Dict]:
+    """Scrape jobs from a single We Work Remotely RSS feed"""
+    try:
+        entries = parse_rss_feed(feed_url, 'WeWorkRemotely')
+        return parse_weworkremotely_entries(entries, default_category)
+    except Exception as e:
+        print(f"⚠️  Error fetching WWR feed {feed_url}: {str(e)}")
+        return []
+
+
 def scrape_weworkremotely() -> List[Dict]:
     """Scrape jobs from We Work Remotely RSS feeds"""
     print("\n🔍 Scraping We Work Remotely...")
 
     jobs = []
-    rss_feeds = [
-        (WEWORKREMOTELY_RSS, 'Engineering'),
-        (REMOTECARE_RSS, 'Customer Support'),
-        (WEWORKREMOTELY_DESIGN_RSS, 'Design'),
-        (WEWORKREMOTELY_MARKETING_RSS, 'Marketing'),
-    ]
+    for feed_url, default_category in WEWORKREMOTELY_FEEDS.items():
+        jobs.extend(scrape_weworkremotely_feed(feed_url, default_category))
+
+    print(f"✅ Found {len(jobs)} jobs from We Work Remotely")
+    return jobs
 
-    for feed_url, default_category in rss_feeds:
+
+def parse_remotive(items: Iterable[Dict], fetched_at: Optional[datetime] = None,
+                   high_water: Optional[datetime] = None) -> List[Dict]:
+    """Normalize Remotive listings into job objects
+
+    Stops pulling from `items` once the feed has gone past `high_water`.
+    """
+    jobs = []
+    older_in_a_row = 0
+    for job in items:
         try:
-            entries = parse_rss_feed(feed_url)
+            # Stop once we are past what the previous run already stored; listings
+            # sharing the high-water timestamp may be new, insert_jobs skips duplicates
+            published = parse_iso_datetime(job.get('publication_date'))
+            if high_water and published and published < high_water:
+                older_in_a_row += 1
+                if older_in_a_row >= HIGH_WATER_GRACE:
+                    break
+                continue
+            older_in_a_row = 0
 
-            for entry in entries[:50]:  # 50 per category
-                try:
-                    # Extract job details
-                    title = entry.get('title', 'Untitled')
-                    link = entry.get('link', '')
-
-                    # Parse description
-                    description = clean_html(entry.get('description', ''))
-
-                    # Extract company from title (usually format: "Company: Job Title")
-                    company = 'Unknown Company'
-                    if ':' in title:
-                        parts = title.split(':', 1)
-                        company = parts[0].strip()
-                        title = parts[1].strip() if len(parts) > 1 else title
-
-                    # Parse published date
-                    published_at = datetime.now(timezone.utc).isoformat()
-
-                    # Generate unique ID from link
-                    source_id = link.split('/')[-1] if link else str(hash(title + company))
-
-                    # Extract salary from description
-                    salary_min, salary_max, currency = extract_salary_from_text(description)
-
-                    job_obj = {
-                        'title': title,
-                        'company': company,
-                        'description': description[:5000],  # Limit length
-                        'location': 'Worldwide',
-                        'job_type': 'Full-time',
-                        'category': default_category,
-                        'tags': [default_category.lower()],
-                        'salary_min': salary_min,
-                        'salary_max': salary_max,
-                        'salary_currency': currency,
-                        'apply_url': link,
-                        'source': 'WeWorkRemotely',
-                        'source_id': source_id,
-                        'published_at': published_at,
-                        'remote_type': 'fully-remote',
-                        'is_active': True,
-                    }
-
-                    jobs.append(job_obj)
+            # Skip if missing required fields
+            if not job.get('id') or not job.get('title') or not job.get('company_name'):
+                continue
 
-                except Exception as e:
-                    print(f"⚠️  Error parsing WWR entry: {str(e)}")
-                    continue
+            # Parse category
+            category = normalize_category([job.get('category', '')])
+
+            # Parse job type
+            job_type_raw = job.get('job_type', 'full-time')
+            job_type = normalize_job_type(job_type_raw)
+
+            # Parse date
+            published_at = job.get('publication_date', (fetched_at or datetime.now(timezone.utc)).isoformat())
+
+            # Extract salary
+            salary_text = job.get('salary', '')
+            salary_min, salary_max, currency = extract_salary_from_text(salary_text)
+
+            # Build tags
+            tags = []
+            if job.get('category'):
+                tags.append(job['category'].lower())
+            if job.get('tags'):
+                tags.extend([tag.lower() for tag in job['tags'][:5]])
+
+            job_obj = {
+                'title': job.get('title', 'Untitled'),
+                'company': job.get('company_name', 'Unknown Company'),
+                'description': job.get('description', 'No description provided.')[:5000],
+                'location': job.get('candidate_required_location', 'Worldwide'),
+                'job_type': job_type,
+                'category': category,
+                'tags': tags[:10],
+                'salary_min': salary_min,
+                'salary_max': salary_max,
+                'salary_currency': currency,
+                'apply_url': job.get('url', ''),
+                'company_url': job.get('company_logo_url', ''),
+                'company_logo_url': job.get('company_logo', ''),
+                'source': 'Remotive',
+                'source_id': str(job.get('id')),
+                'published_at': published_at,
+                'remote_type': 'fully-remote',
+                'is_active': True,
+            }
+
+            jobs.append(job_obj)
 
         except Exception as e:
-            print(f"⚠️  Error fetching WWR feed {feed_url}: {str(e)}")
+            print(f"⚠️  Error parsing Remotive job {job.get('id')}: {str(e)}")
             continue
 
-    print(f"✅ Found {len(jobs)} jobs from We Work Remotely")
     return jobs
 
 
@@ -353,72 +635,10 @@ def scrape_remotive() -> List[Dict]:
     print("\n🔍 Scraping Remotive...")
 
     try:
-        headers = {
-            'User-Agent': 'RemoteJobsHub/1.0 (Job Aggregator)'
-        }
-        params = {
-            'limit': 100  # Get up to 100 jobs
-        }
-        response = requests.get(REMOTIVE_API, headers=headers, params=params, timeout=30)
-        response.raise_for_status()
+        high_water = get_high_water_mark('Remotive')
 
-        data = response.json()
-        jobs_data = data.get('jobs', [])
-
-        jobs = []
-        for job in jobs_data:
-            try:
-                # Skip if missing required fields
-                if not job.get('id') or not job.get('title') or not job.get('company_name'):
-                    continue
-
-                # Parse category
-                category = normalize_category([job.get('category', '')])
-
-                # Parse job type
-                job_type_raw = job.get('job_type', 'full-time')
-                job_type = normalize_job_type(job_type_raw)
-
-                # Parse date
-                published_at = job.get('publication_date', datetime.now(timezone.utc).isoformat())
-
-                # Extract salary
-                salary_text = job.get('salary', '')
-                salary_min, salary_max, currency = extract_salary_from_text(salary_text)
-
-                # Build tags
-                tags = []
-                if job.get('category'):
-                    tags.append(job['category'].lower())
-                if job.get('tags'):
-                    tags.extend([tag.lower() for tag in job['tags'][:5]])
-
-                job_obj = {
-                    'title': job.get('title', 'Untitled'),
-                    'company': job.get('company_name', 'Unknown Company'),
-                    'description': job.get('description', 'No description provided.')[:5000],
-                    'location': job.get('candidate_required_location', 'Worldwide'),
-                    'job_type': job_type,
-                    'category': category,
-                    'tags': tags[:10],
-                    'salary_min': salary_min,
-                    'salary_max': salary_max,
-                    'salary_currency': currency,
-                    'apply_url': job.get('url', ''),
-                    'company_url': job.get('company_logo_url', ''),
-                    'company_logo_url': job.get('company_logo', ''),
-                    'source': 'Remotive',
-                    'source_id': str(job.get('id')),
-                    'published_at': published_at,
-                    'remote_type': 'fully-remote',
-                    'is_active': True,
-                }
-
-                jobs.append(job_obj)
-
-            except Exception as e:
-                print(f"⚠️  Error parsing Remotive job {job.get('id')}: {str(e)}")
-                continue
+        with closing(stream_json_items(REMOTIVE_API, 'Remotive', 'jobs.item', params=REMOTIVE_PARAMS)) as items:
+            jobs = parse_remotive(items, high_water=high_water)
 
         print(f"✅ Found {len(jobs)} jobs from Remotive")
         return jobs
@@ -428,65 +648,72 @@ def scrape_remotive() -> List[Dict]:
         return []
 
 
+def parse_remote_co(entries: List[Dict], fetched_at: Optional[datetime] = None) -> List[Dict]:
+    """Normalize Remote.co RSS entries into job objects"""
+    jobs = []
+
+    for entry in entries[:100]:  # Get up to 100 jobs
+        try:
+            title = entry.get('title', 'Untitled')
+            link = entry.get('link', '')
+            description = clean_html(entry.get('description', ''))
+
+            # Parse company from description or title
+            company = 'Unknown Company'
+            # Remote.co often has company in the title or description
+            if '|' in title:
+                parts = title.split('|')
+                company = parts[0].strip()
+                title = parts[1].strip() if len(parts) > 1 else title
+
+            # Parse published date
+            published_at = (fetched_at or datetime.now(timezone.utc)).isoformat()
+
+            # Generate unique ID from link
+            source_id = link.split('/')[-2] if link else str(hash(title + company))
+
+            # Extract salary
+            salary_min, salary_max, currency = extract_salary_from_text(description)
+
+            # Determine category (default to Engineering for developer RSS)
+            category = 'Engineering'
+            tags = ['developer', 'engineering']
+
+            job_obj = {
+                'title': title,
+                'company': company,
+                'description': description[:5000],
+                'location': 'Worldwide',
+                'job_type': 'Full-time',
+                'category': category,
+                'tags': tags,
+                'salary_min': salary_min,
+                'salary_max': salary_max,
+                'salary_currency': currency,
+                'apply_url': link,
+                'source': 'RemoteCo',
+                'source_id': source_id,
+                'published_at': published_at,
+                'remote_type': 'fully-remote',
+                'is_active': True,
+            }
+
+            jobs.append(job_obj)
+
+        except Exception as e:
+            print(f"⚠️  Error parsing Remote.co entry: {str(e)}")
+            continue
+
+    return jobs
+
+
 def scrape_remote_co() -> List[Dict]:
     """Scrape jobs from Remote.co RSS feed"""
     print("\n🔍 Scraping Remote.co...")
 
     try:
-        entries = parse_rss_feed(REMOTE_CO_RSS)
-        jobs = []
-
-        for entry in entries[:100]:  # Get up to 100 jobs
-            try:
-                title = entry.get('title', 'Untitled')
-                link = entry.get('link', '')
-                description = clean_html(entry.get('description', ''))
-
-                # Parse company from description or title
-                company = 'Unknown Company'
-                # Remote.co often has company in the title or description
-                if '|' in title:
-                    parts = title.split('|')
-                    company = parts[0].strip()
-                    title = parts[1].strip() if len(parts) > 1 else title
-
-                # Parse published date
-                published_at = datetime.now(timezone.utc).isoformat()
-
-                # Generate unique ID from link
-                source_id = link.split('/')[-2] if link else str(hash(title + company))
-
-                # Extract salary
-                salary_min, salary_max, currency = extract_salary_from_text(description)
-
-                # Determine category (default to Engineering for developer RSS)
-                category = 'Engineering'
-                tags = ['developer', 'engineering']
-
-                job_obj = {
-                    'title': title,
-                    'company': company,
-                    'description': description[:5000],
-                    'location': 'Worldwide',
-                    'job_type': 'Full-time',
-                    'category': category,
-                    'tags': tags,
-                    'salary_min': salary_min,
-                    'salary_max': salary_max,
-                    'salary_currency': currency,
-                    'apply_url': link,
-                    'source': 'RemoteCo',
-                    'source_id': source_id,
-                    'published_at': published_at,
-                    'remote_type': 'fully-remote',
-                    'is_active': True,
-                }
-
-                jobs.append(job_obj)
-
-            except Exception as e:
-                print(f"⚠️  Error parsing Remote.co entry: {str(e)}")
-                continue
+        entries = parse_rss_feed(REMOTE_CO_RSS, 'RemoteCo')
+        jobs = parse_remote_co(entries)
 
         print(f"✅ Found {len(jobs)} jobs from Remote.co")
         return jobs
@@ -496,6 +723,42 @@ def scrape_remote_co() -> List[Dict]:
         return []
 
 
+def list_scrape_tasks() -> List[Tuple[str, str, int]]:
+    """List every (source, feed, page) unit of work for one scraper run"""
+    tasks = [('RemoteOK', REMOTEOK_API, 0)]
+    tasks.extend(('WeWorkRemotely', feed_url, 0) for feed_url in WEWORKREMOTELY_FEEDS)
+    tasks.append(('Remotive', REMOTIVE_API, 0))
+    tasks.append(('RemoteCo', REMOTE_CO_RSS, 0))
+    return tasks
+
+
+def run_scrape_task(source: str, feed: str, page: int = 0) -> List[Dict]:
+    """Scrape a single (source, feed, page) task
+
+    Unlike the scrape_* functions, fetch and feed-level parse errors are not
+    swallowed: they reach the work queue, which retries the task and fails it
+    for good once it runs out of attempts. Errors in individual listings are
+    still skipped by the parse_* functions.
+
+    None of the current sources paginate, so `page` is always 0 for now;
+    it is part of the task key so paginated sources can be split later.
+    """
+    if source == 'RemoteOK':
+        high_water = get_high_water_mark('RemoteOK')
+        with closing(stream_json_items(feed, source, 'item', skip=1)) as items:
+            return parse_remoteok(items, high_water=high_water)
+    if source == 'WeWorkRemotely':
+        entries = parse_rss_content(fetch_payload(feed, source))
+        return parse_weworkremotely_entries(entries, WEWORKREMOTELY_FEEDS.get(feed, 'Engineering'))
+    if source == 'Remotive':
+        high_water = get_high_water_mark('Remotive')
+        with closing(stream_json_items(feed, source, 'jobs.item', params=REMOTIVE_PARAMS)) as items:
+            return parse_remotive(items, high_water=high_water)
+    if source == 'RemoteCo':
+        return parse_remote_co(parse_rss_content(fetch_payload(feed, source)))
+    raise ValueError(f"Unknown scrape task source: {source}")
+
+
 def insert_jobs(jobs: List[Dict]) -> Dict[str, int]:
     """Insert jobs into Supabase database"""
     stats = {
@@ -554,6 +817,128 @@ def deactivate_old_jobs(days: int = 30):
         print(f"❌ Error deactivating old jobs: {str(e)}")
 
 
+def parse_payload(source: str, url: str, content: bytes, fetched_at: Optional[datetime] = None) -> List[Dict]:
+    """Run the normalization pipeline for a source over a raw payload"""
+    if source == 'RemoteOK':
+        return parse_remoteok(iter_json_items(BytesIO(content), 'item', skip=1), fetched_at)
+    if source == 'WeWorkRemotely':
+        entries = parse_rss_content(content)
+        return parse_weworkremotely_entries(entries, WEWORKREMOTELY_FEEDS.get(url, 'Engineering'), fetched_at)
+    if source == 'Remotive':
+        return parse_remotive(iter_json_items(BytesIO(content), 'jobs.item'), fetched_at)
+    if source == 'RemoteCo':
+        return parse_remote_co(parse_rss_content(content), fetched_at)
+    raise ValueError(f"Unknown payload source: {source}")
+
+
+def find_existing_source_ids(source: str, source_ids: List[str]) -> set:
+    """Return the subset of source_ids that already have a row for this source"""
+    existing = set()
+    for i in range(0, len(source_ids), SOURCE_ID_LOOKUP_BATCH_SIZE):
+        chunk = source_ids[i:i + SOURCE_ID_LOOKUP_BATCH_SIZE]
+        response = supabase.table('jobs').select('source_id').eq('source', source).in_('source_id', chunk).execute()
+        existing.update(row['source_id'] for row in response.data or [])
+    return existing
+
+
+def strip_reparse_fields(job: Dict, fetched_at: datetime) -> Dict:
+    """Drop the columns a re-parse must not overwrite
+
+    `is_active` and `is_featured` are owned by the database (deactivation and
+    operators), not by the payload. `published_at` is dropped when the parser
+    fell back to the fetch time (WWR and Remote.co always, RemoteOK and
+    Remotive when the listing has no date), because the archived fetch is
+    not necessarily the one that first inserted the row.
+    """
+    job.pop('is_active', None)
+    job.pop('is_featured', None)
+    if job.get('published_at') in (None, fetched_at.isoformat()):
+        job.pop('published_at', None)
+    return job
+
+
+def reparse_archive(source: Optional[str] = None, since: Optional[datetime] = None,
+                    dry_run: bool = False) -> Dict[str, int]:
+    """Re-run the current parsers over archived payloads and bulk-update the jobs
+
+    No job source is contacted. Each distinct payload is parsed once, at its
+    first fetch time, and for each (source, source_id) the first payload that
+    contained it wins. Only jobs that already have a row are updated;
+    archived listings that were never inserted (or were deleted) are counted
+    as `missing` and skipped. Columns the payload does not own are left alone
+    (see strip_reparse_fields), so re-parsing never revives deactivated jobs,
+    clears featured flags or moves fetch-time dates.
+    """
+    print("\n♻️  Re-parsing archived payloads...")
+
+    stats = {'payloads': 0, 'jobs': 0, 'updated': 0, 'missing': 0, 'errors': 0}
+    seen_payloads = set()
+    jobs_by_key: Dict[Tuple[str, str], Dict] = {}
+
+    for record in iter_manifest(source, since):
+        payload_key = (record['hash'], record['url'])
+        if payload_key in seen_payloads:
+            continue
+        seen_payloads.add(payload_key)
+
+        try:
+            content = load_payload(record['hash'])
+            fetched_at = datetime.fromisoformat(record['fetched_at'])
+            jobs = parse_payload(record['source'], record['url'], content, fetched_at)
+        except Exception as e:
+            stats['errors'] += 1
+            print(f"  ❌ Error re-parsing {record['hash'][:12]} from {record['url']}: {str(e)}")
+            continue
+
+        stats['payloads'] += 1
+        for job in jobs:
+            jobs_by_key.setdefault((job['source'], job['source_id']), strip_reparse_fields(job, fetched_at))
+
+    stats['jobs'] = len(jobs_by_key)
+    print(f"✅ Parsed {stats['payloads']} payloads into {stats['jobs']} distinct jobs")
+
+    if dry_run or not jobs_by_key:
+        return stats
+
+    jobs_by_source: Dict[str, List[Dict]] = {}
+    for job in jobs_by_key.values():
+        jobs_by_source.setdefault(job['source'], []).append(job)
+
+    for source_name, rows in jobs_by_source.items():
+        try:
+            existing = find_existing_source_ids(source_name, [row['source_id'] for row in rows])
+        except Exception as e:
+            stats['errors'] += 1
+            print(f"  ❌ Error looking up existing {source_name} jobs: {str(e)}")
+            continue
+
+        missing = len(rows) - len(existing)
+        if missing:
+            stats['missing'] += missing
+            print(f"  ⏭️  Skipping {missing} {source_name} jobs with no existing row")
+
+        # A bulk upsert writes the union of its rows' columns (missing ones as
+        # NULL), so rows with and without published_at go in separate batches
+        rows_by_columns: Dict[Tuple[str, ...], List[Dict]] = {}
+        for row in rows:
+            if row['source_id'] in existing:
+                rows_by_columns.setdefault(tuple(sorted(row)), []).append(row)
+
+        # Every row exists, so the upsert only ever takes its update path
+        for column_rows in rows_by_columns.values():
+            for i in range(0, len(column_rows), REPARSE_BATCH_SIZE):
+                batch = column_rows[i:i + REPARSE_BATCH_SIZE]
+                try:
+                    supabase.table('jobs').upsert(batch, on_conflict='source,source_id').execute()
+                    stats['updated'] += len(batch)
+                    print(f"  ✅ Updated {len(batch)} {source_name} jobs")
+                except Exception as e:
+                    stats['errors'] += 1
+                    print(f"  ❌ Error updating {source_name} batch: {str(e)}")
+
+    return stats
+
+
 def main():
     """Main scraper function"""
     print("=" * 70)
@@ -622,4 +1007,22 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description='Remote jobs scraper')
+    parser.add_argument('mode', nargs='?', default='scrape', choices=['scrape', 'reparse'],
+                        help='scrape the sources, or re-parse archived payloads offline')
+    parser.add_argument('--source', help='reparse: only payloads from this source (e.g. RemoteOK)')
+    parser.add_argument('--since', type=datetime.fromisoformat,
+                        help='reparse: only payloads fetched at or after this ISO date')
+    parser.add_argument('--dry-run', action='store_true', help='reparse: parse without updating the database')
+    args = parser.parse_args()
+
+    if args.mode == 'reparse':
+        since = args.since
+        if since and since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        reparse_stats = reparse_archive(args.source, since, args.dry_run)
+        print(f"\n📊 Re-parse: {reparse_stats['payloads']} payloads, {reparse_stats['jobs']} jobs, "
+              f"{reparse_stats['updated']} updated, {reparse_stats['missing']} missing, "
+              f"{reparse_stats['errors']} errors")
+    else:
+        main()
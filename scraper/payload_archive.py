@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Raw Payload Archive
+Content-addressed, compressed store of every raw HTTP payload the scraper fetches.
+
+Layout:
+    <archive>/objects/ab/abcdef....gz   payload keyed by its SHA-256, stored once
+    <archive>/manifest.ndjson           one line per fetch: source, url, hash, fetched_at
+
+Payloads are compressed with zstd when the `zstandard` package is installed
+and with gzip otherwise; both are readable regardless of which one wrote them.
+PayloadWriter hashes and compresses a payload chunk by chunk, so streamed
+responses are archived without holding the body in memory.
+"""
+
+import os
+import json
+import gzip
+import hashlib
+import tempfile
+from datetime import datetime, timezone
+from typing import Dict, Iterator, Optional
+
+try:
+    import zstandard
+except ImportError:  # optional, gzip is used instead
+    zstandard = None
+
+ARCHIVE_DIR = os.getenv(
+    'PAYLOAD_ARCHIVE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'archive'),
+)
+
+MANIFEST_NAME = 'manifest.ndjson'
+
+
+def _object_path(content_hash: str, extension: str) -> str:
+    return os.path.join(ARCHIVE_DIR, 'objects', content_hash[:2], content_hash + extension)
+
+
+def _find_object(content_hash: str) -> Optional[str]:
+    for extension in ('.zst', '.gz'):
+        path = _object_path(content_hash, extension)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+class PayloadWriter:
+    """Archive one payload incrementally: write() chunks, then close() or abort()
+
+    Chunks are hashed and compressed into a temp file as they arrive. close()
+    moves the file into place under its hash (or drops it if that content is
+    already stored) and records the fetch in the manifest.
+    """
+
+    def __init__(self, source: str, url: str):
+        self.source = source
+        self.url = url
+        self.size = 0
+        self._hash = hashlib.sha256()
+
+        objects_dir = os.path.join(ARCHIVE_DIR, 'objects')
+        os.makedirs(objects_dir, exist_ok=True)
+        # Temp file on the same filesystem, so the final rename is atomic
+        # and concurrent workers never see half an object
+        fd, self._tmp_path = tempfile.mkstemp(dir=objects_dir, suffix='.tmp')
+        self._file = os.fdopen(fd, 'wb')
+        if zstandard is not None:
+            self._extension = '.zst'
+            self._compressor = zstandard.ZstdCompressor(level=10).stream_writer(self._file)
+        else:
+            self._extension = '.gz'
+            self._compressor = gzip.GzipFile(fileobj=self._file, mode='wb', compresslevel=9)
+
+    def write(self, chunk: bytes) -> None:
+        self._hash.update(chunk)
+        self._compressor.write(chunk)
+        self.size += len(chunk)
+
+    def close(self) -> str:
+        """Store the object (once per distinct content), record the fetch and return its hash"""
+        self._compressor.close()
+        self._file.close()
+        content_hash = self._hash.hexdigest()
+
+        if _find_object(content_hash) is None:
+            path = _object_path(content_hash, self._extension)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(self._tmp_path, path)
+        else:
+            os.remove(self._tmp_path)
+
+        record = {
+            'source': self.source,
+            'url': self.url,
+            'hash': content_hash,
+            'size': self.size,
+            'fetched_at': datetime.now(timezone.utc).isoformat(),
+        }
+        with open(os.path.join(ARCHIVE_DIR, MANIFEST_NAME), 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + '\n')
+
+        return content_hash
+
+    def abort(self) -> None:
+        """Drop a partially written payload without recording it"""
+        try:
+            self._compressor.close()
+            self._file.close()
+        finally:
+            if os.path.exists(self._tmp_path):
+                os.remove(self._tmp_path)
+
+
+def archive_payload(source: str, url: str, content: bytes) -> str:
+    """Store a raw payload (once per distinct content) and record the fetch"""
+    writer = PayloadWriter(source, url)
+    try:
+        writer.write(content)
+    except BaseException:
+        writer.abort()
+        raise
+    return writer.close()
+
+
+def load_payload(content_hash: str) -> bytes:
+    """Read an archived payload back"""
+    path = _find_object(content_hash)
+    if path is None:
+        raise FileNotFoundError(f"Payload {content_hash} is not in the archive")
+
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    if path.endswith('.zst'):
+        if zstandard is None:
+            raise RuntimeError("Payload is zstd-compressed but the zstandard package is not installed")
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    return gzip.decompress(data)
+
+
+def iter_manifest(source: Optional[str] = None, since: Optional[datetime] = None) -> Iterator[Dict]:
+    """Yield manifest records in fetch order, optionally filtered by source and fetch time"""
+    path = os.path.join(ARCHIVE_DIR, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return
+
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if source and record['source'] != source:
+                continue
+            if since and datetime.fromisoformat(record['fetched_at']) < since:
+                continue
+            yield record
@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+Distributed Scrape Work Queue
+Runs the scraper as a Postgres-backed work queue so any number of workers,
+on any number of machines, can share one scraper run.
+
+Every (source, feed, page) is a row in `scrape_tasks`. Workers claim rows with
+FOR UPDATE SKIP LOCKED and hold them under a lease, which a heartbeat thread
+keeps extending while the task runs; a task whose lease expired (the worker
+crashed or was killed) becomes claimable again.
+
+Usage:
+    python work_queue.py enqueue                 # queue all tasks for a new run
+    python work_queue.py work --processes 4      # start 4 local worker processes
+    python work_queue.py status --run-id <id>    # show progress of a run
+
+check_work_queue.py exercises the queue with several local worker processes
+against a local Postgres.
+"""
+
+import os
+import sys
+import time
+import socket
+import argparse
+import threading
+import multiprocessing
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+import psycopg2
+import psycopg2.extras
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Direct Postgres connection string (Supabase: Settings > Database > Connection string)
+DATABASE_URL = os.getenv('DATABASE_URL')
+
+# Default lease length; a worker that stops heartbeating for this long
+# (crashed, killed, partitioned) loses its task to another worker
+DEFAULT_LEASE_SECONDS = 120
+
+# Heartbeats per lease period, so a single missed heartbeat does not lose the lease
+HEARTBEATS_PER_LEASE = 3
+
+# How long an idle worker waits before polling again in --wait mode
+POLL_INTERVAL_SECONDS = 5
+
+ENQUEUE_SQL = """
+INSERT INTO public.scrape_tasks (run_id, source, feed, page, max_attempts)
+VALUES %s
+ON CONFLICT (run_id, source, feed, page) DO NOTHING
+"""
+
+# Tasks that ran out of attempts while their lease expired are given up on,
+# otherwise they would stay 'running' forever
+EXPIRE_SQL = """
+UPDATE public.scrape_tasks
+SET status = 'failed',
+    last_error = coalesce(last_error, 'lease expired'),
+    lease_expires_at = NULL,
+    finished_at = NOW()
+WHERE status = 'running'
+  AND lease_expires_at < NOW()
+  AND attempts >= max_attempts
+"""
+
+CLAIM_SQL = """
+UPDATE public.scrape_tasks AS t
+SET status = 'running',
+    worker_id = %(worker_id)s,
+    attempts = t.attempts + 1,
+    lease_expires_at = NOW() + make_interval(secs => %(lease_seconds)s)
+WHERE t.id = (
+  SELECT id FROM public.scrape_tasks
+  WHERE (status = 'pending' OR (status = 'running' AND lease_expires_at < NOW()))
+    AND attempts < max_attempts
+    AND (%(run_id)s::text IS NULL OR run_id = %(run_id)s)
+  ORDER BY id
+  LIMIT 1
+  FOR UPDATE SKIP LOCKED
+)
+RETURNING t.id, t.run_id, t.source, t.feed, t.page, t.attempts
+"""
+
+HEARTBEAT_SQL = """
+UPDATE public.scrape_tasks
+SET lease_expires_at = NOW() + make_interval(secs => %(lease_seconds)s)
+WHERE id = %(id)s AND worker_id = %(worker_id)s AND status = 'running'
+"""
+
+# The worker_id guard stops a worker whose lease was reclaimed from
+# overwriting the result of the worker that took the task over
+COMPLETE_SQL = """
+UPDATE public.scrape_tasks
+SET status = 'done',
+    lease_expires_at = NULL,
+    finished_at = NOW(),
+    last_error = NULL,
+    jobs_found = %(jobs_found)s,
+    jobs_inserted = %(jobs_inserted)s
+WHERE id = %(id)s AND worker_id = %(worker_id)s AND status = 'running'
+"""
+
+FAIL_SQL = """
+UPDATE public.scrape_tasks
+SET status = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'pending' END,
+    lease_expires_at = NULL,
+    finished_at = CASE WHEN attempts >= max_attempts THEN NOW() ELSE NULL END,
+    last_error = %(error)s
+WHERE id = %(id)s AND worker_id = %(worker_id)s AND status = 'running'
+"""
+
+STATUS_SQL = """
+SELECT status, COUNT(*) AS tasks, COALESCE(SUM(jobs_found), 0) AS jobs_found,
+       COALESCE(SUM(jobs_inserted), 0) AS jobs_inserted
+FROM public.scrape_tasks
+WHERE run_id = %s
+GROUP BY status
+ORDER BY status
+"""
+
+
+def connect():
+    """Open a Postgres connection to the queue database"""
+    if not DATABASE_URL:
+        print("❌ Error: Missing DATABASE_URL in .env file")
+        sys.exit(1)
+    return psycopg2.connect(DATABASE_URL)
+
+
+def make_worker_id() -> str:
+    """Identify a worker process across machines"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def enqueue_run(conn, run_id: Optional[str] = None, max_attempts: int = 3,
+                tasks: Optional[List[Tuple[str, str, int]]] = None) -> str:
+    """Queue scrape tasks (all configured sources by default) for a run and return its run id"""
+    run_id = run_id or datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    # job_scraper needs Supabase credentials at import time, so it is only
+    # imported where real scraping happens; check_work_queue.py runs without it
+    if tasks is None:
+        from job_scraper import list_scrape_tasks
+        tasks = list_scrape_tasks()
+    rows = [(run_id, source, feed, page, max_attempts) for source, feed, page in tasks]
+
+    with conn, conn.cursor() as cur:
+        psycopg2.extras.execute_values(cur, ENQUEUE_SQL, rows)
+
+    print(f"📋 Queued {len(rows)} tasks for run {run_id}")
+    return run_id
+
+
+def claim_task(conn, worker_id: str, lease_seconds: int, run_id: Optional[str] = None) -> Optional[Dict]:
+    """Claim the next free task, or reclaim one whose lease expired"""
+    with conn, conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+        cur.execute(EXPIRE_SQL)
+        cur.execute(CLAIM_SQL, {'worker_id': worker_id, 'lease_seconds': lease_seconds, 'run_id': run_id})
+        return cur.fetchone()
+
+
+class LeaseLost(Exception):
+    """The task's lease was taken over by another worker"""
+
+
+class LeaseHeartbeat(threading.Thread):
+    """Keeps extending a claimed task's lease until stopped
+
+    Uses its own connection, so it keeps beating while the worker's thread is
+    busy inside a long fetch or insert. If the lease is found taken over
+    (the worker stalled past it), `lost` is set and the heartbeat stops;
+    task runners check it through the `lease_lost` callback they are given.
+    """
+
+    def __init__(self, task: Dict, worker_id: str, lease_seconds: int):
+        super().__init__(daemon=True)
+        self.task = task
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+        self.lost = False
+        self._stopped = threading.Event()
+
+    def run(self):
+        conn = connect()
+        try:
+            while not self._stopped.wait(self.lease_seconds / HEARTBEATS_PER_LEASE):
+                try:
+                    with conn, conn.cursor() as cur:
+                        cur.execute(HEARTBEAT_SQL, {
+                            'id': self.task['id'],
+                            'worker_id': self.worker_id,
+                            'lease_seconds': self.lease_seconds,
+                        })
+                        if cur.rowcount == 0:
+                            self.lost = True
+                            return
+                except psycopg2.Error as e:
+                    # Transient; the next beat retries well before the lease runs out
+                    print(f"⚠️  [{self.worker_id}] Heartbeat for task {self.task['id']} failed: {str(e)}")
+        finally:
+            conn.close()
+
+    def stop(self):
+        self._stopped.set()
+        self.join()
+
+
+def scrape_and_insert(task: Dict, lease_lost: Callable[[], bool]) -> Tuple[int, int]:
+    """Default task runner: scrape the task's feed and insert the jobs
+
+    Gives up before inserting if the lease was lost during the fetch, since
+    another worker is already running the same task.
+    """
+    from job_scraper import run_scrape_task, insert_jobs
+
+    jobs = run_scrape_task(task['source'], task['feed'], task['page'])
+    if lease_lost():
+        raise LeaseLost(f"Lease on task {task['id']} lost during fetch")
+    insert_stats = insert_jobs(jobs) if jobs else {'inserted': 0}
+    return len(jobs), insert_stats['inserted']
+
+
+def complete_task(conn, task: Dict, worker_id: str, jobs_found: int, jobs_inserted: int) -> bool:
+    """Mark a task done; returns False if the lease was lost to another worker"""
+    with conn, conn.cursor() as cur:
+        cur.execute(COMPLETE_SQL, {
+            'id': task['id'],
+            'worker_id': worker_id,
+            'jobs_found': jobs_found,
+            'jobs_inserted': jobs_inserted,
+        })
+        return cur.rowcount == 1
+
+
+def fail_task(conn, task: Dict, worker_id: str, error: str) -> None:
+    """Release a failed task for retry, or fail it for good once out of attempts"""
+    with conn, conn.cursor() as cur:
+        cur.execute(FAIL_SQL, {'id': task['id'], 'worker_id': worker_id, 'error': error[:1000]})
+
+
+def run_worker(lease_seconds: int = DEFAULT_LEASE_SECONDS, wait: bool = False,
+               run_task: Optional[Callable[[Dict, Callable[[], bool]], Tuple[int, int]]] = None,
+               run_id: Optional[str] = None) -> Dict[str, int]:
+    """Claim and run tasks until the queue is drained (or forever with wait=True)
+
+    `run_task(task, lease_lost)` returns (jobs_found, jobs_inserted) and
+    defaults to scraping; it should raise LeaseLost once `lease_lost()` is
+    true. `run_id` restricts the worker to one run.
+    """
+    run_task = run_task or scrape_and_insert
+    worker_id = make_worker_id()
+    conn = connect()
+    stats = {'done': 0, 'failed': 0, 'lost': 0}
+
+    print(f"👷 Worker {worker_id} started")
+
+    try:
+        while True:
+            task = claim_task(conn, worker_id, lease_seconds, run_id)
+
+            if task is None:
+                if not wait:
+                    break
+                time.sleep(POLL_INTERVAL_SECONDS)
+                continue
+
+            print(f"\n▶️  [{worker_id}] {task['source']} {task['feed']} "
+                  f"page {task['page']} (attempt {task['attempts']})")
+
+            heartbeat = LeaseHeartbeat(task, worker_id, lease_seconds)
+            heartbeat.start()
+            try:
+                jobs_found, jobs_inserted = run_task(task, lambda: heartbeat.lost)
+            except LeaseLost as e:
+                # The task belongs to another worker now; leave its row alone
+                stats['lost'] += 1
+                print(f"⚠️  [{worker_id}] {str(e)}, stopping early")
+                continue
+            except Exception as e:
+                stats['failed'] += 1
+                print(f"❌ [{worker_id}] Task {task['id']} failed: {str(e)}")
+                fail_task(conn, task, worker_id, str(e))
+                continue
+            finally:
+                heartbeat.stop()
+
+            if complete_task(conn, task, worker_id, jobs_found, jobs_inserted):
+                stats['done'] += 1
+            else:
+                stats['lost'] += 1
+                print(f"⚠️  [{worker_id}] Lease on task {task['id']} expired before it finished")
+    finally:
+        conn.close()
+
+    print(f"\n✅ Worker {worker_id} finished: {stats['done']} done, "
+          f"{stats['failed']} failed, {stats['lost']} lost leases")
+    return stats
+
+
+def print_run_status(conn, run_id: str) -> None:
+    """Print task counts per status for a run"""
+    with conn, conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+        cur.execute(STATUS_SQL, (run_id,))
+        rows = cur.fetchall()
+
+    if not rows:
+        print(f"⚠️  No tasks found for run {run_id}")
+        return
+
+    print(f"📊 Run {run_id}:")
+    for row in rows:
+        print(f"   • {row['status']}: {row['tasks']} tasks, "
+              f"{row['jobs_found']} jobs found, {row['jobs_inserted']} inserted")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Distributed scrape work queue')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    enqueue_parser = subparsers.add_parser('enqueue', help='Queue all scrape tasks for a new run')
+    enqueue_parser.add_argument('--run-id', help='Run id (defaults to the current UTC timestamp)')
+    enqueue_parser.add_argument('--max-attempts', type=int, default=3)
+
+    work_parser = subparsers.add_parser('work', help='Claim and run queued tasks')
+    work_parser.add_argument('--processes', type=int, default=1, help='Local worker processes to start')
+    work_parser.add_argument('--lease', type=int, default=DEFAULT_LEASE_SECONDS, help='Lease length in seconds')
+    work_parser.add_argument('--wait', action='store_true', help='Keep polling when the queue is empty')
+    work_parser.add_argument('--run-id', help='Only work on tasks of this run')
+
+    status_parser = subparsers.add_parser('status', help='Show progress of a run')
+    status_parser.add_argument('--run-id', required=True)
+
+    args = parser.parse_args()
+
+    if args.command == 'enqueue':
+        conn = connect()
+        try:
+            run_id = enqueue_run(conn, args.run_id, args.max_attempts)
+        finally:
+            conn.close()
+        # Deactivation is run-wide rather than per task, so the coordinator does it once
+        from job_scraper import deactivate_old_jobs
+        deactivate_old_jobs(days=30)
+
+    elif args.command == 'work':
+        if args.processes <= 1:
+            run_worker(args.lease, args.wait, run_id=args.run_id)
+            return
+
+        workers = [
+            multiprocessing.Process(target=run_worker, args=(args.lease, args.wait, None, args.run_id))
+            for _ in range(args.processes)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+    elif args.command == 'status':
+        conn = connect()
+        try:
+            print_run_status(conn, args.run_id)
+        finally:
+            conn.close()
+
+
+if __name__ == "__main__":
+    main()
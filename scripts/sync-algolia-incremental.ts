@@ -0,0 +1,140 @@
+/**
+ * Incremental Algolia Sync Script
+ * Pushes only changed jobs (the trigger-filled job_changes outbox) to Algolia.
+ * Inserted/updated active jobs are saved, deactivated or deleted jobs are removed.
+ * Use sync-algolia.ts for the initial load and index settings.
+ */
+
+import algoliasearch from 'algoliasearch';
+import { createClient } from '@supabase/supabase-js';
+
+// Configuration
+const SUPABASE_URL = process.env.SUPABASE_URL || process.env.VITE_SUPABASE_URL;
+const SUPABASE_SERVICE_KEY = process.env.SUPABASE_SERVICE_KEY;
+const ALGOLIA_APP_ID = process.env.ALGOLIA_APP_ID || process.env.VITE_ALGOLIA_APP_ID;
+const ALGOLIA_ADMIN_KEY = process.env.ALGOLIA_ADMIN_KEY; // Use admin key for indexing
+const ALGOLIA_INDEX_NAME = process.env.ALGOLIA_INDEX_NAME || process.env.VITE_ALGOLIA_INDEX_NAME || 'jobs';
+
+if (!SUPABASE_URL || !SUPABASE_SERVICE_KEY) {
+  console.error('❌ Missing Supabase credentials');
+  process.exit(1);
+}
+
+if (!ALGOLIA_APP_ID || !ALGOLIA_ADMIN_KEY) {
+  console.error('❌ Missing Algolia credentials');
+  console.log('ℹ️  Note: You need ALGOLIA_ADMIN_KEY (not search key) to update the index');
+  process.exit(1);
+}
+
+// Initialize clients
+const supabase = createClient(SUPABASE_URL, SUPABASE_SERVICE_KEY);
+const algoliaClient = algoliasearch(ALGOLIA_APP_ID, ALGOLIA_ADMIN_KEY);
+const index = algoliaClient.initIndex(ALGOLIA_INDEX_NAME);
+
+const changeBatchSize = 1000; // Outbox rows handled per round
+const idChunkSize = 200; // Keeps `in (...)` filters well under URL length limits
+
+function chunk<T>(items: T[], size: number): T[][] {
+  const chunks: T[][] = [];
+  for (let i = 0; i < items.length; i += size) {
+    chunks.push(items.slice(i, i + size));
+  }
+  return chunks;
+}
+
+async function syncChangesToAlgolia() {
+  console.log('🔄 Starting incremental Algolia sync...');
+  console.log(`📊 Syncing to index: ${ALGOLIA_INDEX_NAME}`);
+
+  let totalChanges = 0;
+  let totalSaved = 0;
+  let totalDeleted = 0;
+
+  try {
+    while (true) {
+      // Oldest pending changes first
+      const { data: changes, error } = await supabase
+        .from('job_changes')
+        .select('id, job_id, operation')
+        .is('synced_at', null)
+        .order('id', { ascending: true })
+        .limit(changeBatchSize);
+
+      if (error) {
+        throw error;
+      }
+
+      if (!changes || changes.length === 0) {
+        break;
+      }
+
+      // Several changes to one job collapse into a single index operation;
+      // the current row state decides whether it is saved or removed
+      const jobIds = [...new Set(changes.map(change => change.job_id as string))];
+
+      const activeJobs: any[] = [];
+      for (const ids of chunk(jobIds, idChunkSize)) {
+        const { data, error: jobsError } = await supabase
+          .from('jobs')
+          .select('*')
+          .in('id', ids)
+          .eq('is_active', true);
+
+        if (jobsError) {
+          throw jobsError;
+        }
+
+        activeJobs.push(...(data || []));
+      }
+
+      const activeIds = new Set(activeJobs.map(job => job.id));
+      const removedIds = jobIds.filter(id => !activeIds.has(id));
+
+      if (activeJobs.length > 0) {
+        await index.saveObjects(activeJobs.map(job => ({
+          ...job,
+          objectID: job.id, // Algolia requires objectID
+        })));
+      }
+
+      if (removedIds.length > 0) {
+        await index.deleteObjects(removedIds);
+      }
+
+      // Mark exactly the changes we handled, so rows added meanwhile are kept
+      for (const ids of chunk(changes.map(change => change.id), idChunkSize)) {
+        const { error: markError } = await supabase
+          .from('job_changes')
+          .update({ synced_at: new Date().toISOString() })
+          .in('id', ids);
+
+        if (markError) {
+          throw markError;
+        }
+      }
+
+      totalChanges += changes.length;
+      totalSaved += activeJobs.length;
+      totalDeleted += removedIds.length;
+      console.log(`   Synced ${changes.length} changes (${activeJobs.length} saved, ${removedIds.length} removed)`);
+
+      if (changes.length < changeBatchSize) {
+        break;
+      }
+    }
+
+    if (totalChanges === 0) {
+      console.log('✅ Index is up to date, no pending changes');
+      return;
+    }
+
+    console.log(`\n✅ Incremental sync completed: ${totalChanges} changes, ${totalSaved} saved, ${totalDeleted} removed`);
+
+  } catch (error) {
+    console.error('❌ Error syncing changes to Algolia:', error);
+    process.exit(1);
+  }
+}
+
+// Run the sync
+syncChangesToAlgolia();
@@ -0,0 +1,54 @@
+-- Distributed scrape task queue
+-- Each (source, feed, page) of a scraper run is one task. Workers on any
+-- number of machines claim tasks with FOR UPDATE SKIP LOCKED and hold them
+-- under a lease; tasks whose lease expired (crashed worker) are reclaimed.
+
+CREATE TABLE IF NOT EXISTS public.scrape_tasks (
+  id BIGSERIAL PRIMARY KEY,
+
+  -- Task identity
+  run_id TEXT NOT NULL,
+  source TEXT NOT NULL,
+  feed TEXT NOT NULL,
+  page INTEGER NOT NULL DEFAULT 0,
+
+  -- Queue state
+  status TEXT NOT NULL DEFAULT 'pending'
+    CHECK (status IN ('pending', 'running', 'done', 'failed')),
+  attempts INTEGER NOT NULL DEFAULT 0,
+  max_attempts INTEGER NOT NULL DEFAULT 3,
+  worker_id TEXT,
+  lease_expires_at TIMESTAMPTZ,
+  last_error TEXT,
+
+  -- Results
+  jobs_found INTEGER,
+  jobs_inserted INTEGER,
+
+  -- Internal
+  created_at TIMESTAMPTZ DEFAULT NOW(),
+  updated_at TIMESTAMPTZ DEFAULT NOW(),
+  finished_at TIMESTAMPTZ,
+
+  -- Constraints
+  CONSTRAINT unique_scrape_task UNIQUE(run_id, source, feed, page)
+);
+
+-- Workers only ever scan claimable tasks
+CREATE INDEX IF NOT EXISTS idx_scrape_tasks_claimable
+  ON public.scrape_tasks(status, lease_expires_at, id)
+  WHERE status IN ('pending', 'running');
+
+CREATE INDEX IF NOT EXISTS idx_scrape_tasks_run
+  ON public.scrape_tasks(run_id);
+
+-- Only the service role / direct Postgres connections touch the queue
+ALTER TABLE public.scrape_tasks ENABLE ROW LEVEL SECURITY;
+
+-- Keep updated_at in sync
+CREATE TRIGGER set_scrape_tasks_updated_at
+  BEFORE UPDATE ON public.scrape_tasks
+  FOR EACH ROW
+  EXECUTE FUNCTION public.handle_updated_at();
+
+COMMENT ON TABLE public.scrape_tasks IS 'Work queue of (source, feed, page) scrape tasks claimed by workers under a lease';
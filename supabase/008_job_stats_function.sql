@@ -0,0 +1,111 @@
+-- Job stats RPC for the stats/health CLI (job_stats.py)
+-- Returns counts and freshness as one small JSON document. Counts come from a
+-- trigger-maintained counter table and freshness from index probes, so the
+-- cost depends on the number of sources/categories, not on the number of jobs.
+
+-- Job counts per source, category and is_active, kept current by a trigger
+CREATE TABLE IF NOT EXISTS public.job_counts (
+  source TEXT NOT NULL,
+  category TEXT NOT NULL,
+  is_active BOOLEAN NOT NULL,
+  jobs BIGINT NOT NULL DEFAULT 0,
+  PRIMARY KEY (source, category, is_active)
+);
+
+ALTER TABLE public.job_counts ENABLE ROW LEVEL SECURITY;
+
+-- NULL is_active counts as inactive, like the public read policy treats it
+CREATE OR REPLACE FUNCTION public.update_job_counts()
+RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    UPDATE public.job_counts
+    SET jobs = jobs - 1
+    WHERE source = OLD.source
+      AND category = OLD.category
+      AND is_active = COALESCE(OLD.is_active, FALSE);
+  END IF;
+
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    INSERT INTO public.job_counts (source, category, is_active, jobs)
+    VALUES (NEW.source, NEW.category, COALESCE(NEW.is_active, FALSE), 1)
+    ON CONFLICT (source, category, is_active)
+    DO UPDATE SET jobs = public.job_counts.jobs + 1;
+  END IF;
+
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+-- Create the trigger and backfill under one lock so no write is counted twice or missed
+LOCK TABLE public.jobs IN SHARE ROW EXCLUSIVE MODE;
+
+DROP TRIGGER IF EXISTS maintain_job_counts ON public.jobs;
+CREATE TRIGGER maintain_job_counts
+  AFTER INSERT OR DELETE OR UPDATE OF source, category, is_active ON public.jobs
+  FOR EACH ROW
+  EXECUTE FUNCTION public.update_job_counts();
+
+TRUNCATE public.job_counts;
+INSERT INTO public.job_counts (source, category, is_active, jobs)
+SELECT source, category, COALESCE(is_active, FALSE), COUNT(*)
+FROM public.jobs
+GROUP BY source, category, COALESCE(is_active, FALSE);
+
+-- Newest published_at / created_at per source without scanning the table
+CREATE INDEX IF NOT EXISTS idx_jobs_source_published
+  ON public.jobs(source, published_at DESC);
+
+CREATE INDEX IF NOT EXISTS idx_jobs_source_created
+  ON public.jobs(source, created_at DESC);
+
+CREATE OR REPLACE FUNCTION public.get_job_stats()
+RETURNS JSONB AS $$
+  WITH RECURSIVE sources AS (
+    -- Loose index scan: one index probe per distinct source
+    (SELECT source FROM public.jobs ORDER BY source LIMIT 1)
+    UNION ALL
+    SELECT (SELECT j.source FROM public.jobs j WHERE j.source > s.source ORDER BY j.source LIMIT 1)
+    FROM sources s
+    WHERE s.source IS NOT NULL
+  ),
+  freshness AS (
+    SELECT
+      s.source,
+      (SELECT j.published_at FROM public.jobs j
+        WHERE j.source = s.source ORDER BY j.published_at DESC LIMIT 1) AS newest_published_at,
+      (SELECT j.created_at FROM public.jobs j
+        WHERE j.source = s.source ORDER BY j.created_at DESC LIMIT 1) AS last_new_job_at
+    FROM sources s
+    WHERE s.source IS NOT NULL
+  ),
+  counts AS (
+    SELECT source, category, is_active, jobs
+    FROM public.job_counts
+    WHERE jobs > 0
+  )
+  SELECT jsonb_build_object(
+    'generated_at', NOW(),
+    'counts', COALESCE(
+      (SELECT jsonb_agg(to_jsonb(c) ORDER BY c.source, c.category, c.is_active) FROM counts c),
+      '[]'::jsonb
+    ),
+    'freshness', COALESCE(
+      (SELECT jsonb_agg(jsonb_build_object(
+          'source', f.source,
+          'newest_published_at', f.newest_published_at,
+          'last_new_job_at', f.last_new_job_at,
+          'seconds_since_new_job', EXTRACT(EPOCH FROM NOW() - f.last_new_job_at)
+        ) ORDER BY f.source)
+       FROM freshness f),
+      '[]'::jsonb
+    )
+  );
+$$ LANGUAGE sql STABLE;
+
+-- Stats are for operators only
+REVOKE EXECUTE ON FUNCTION public.get_job_stats() FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.get_job_stats() TO service_role;
+
+COMMENT ON TABLE public.job_counts IS 'Job counts per source/category/is_active, maintained by the maintain_job_counts trigger';
+COMMENT ON FUNCTION public.get_job_stats IS 'Job counts per source/category/is_active, newest job and newest insert per source';
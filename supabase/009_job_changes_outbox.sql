@@ -0,0 +1,72 @@
+-- Job change outbox for incremental search-index sync
+-- A trigger on jobs appends one row per inserted, updated, deactivated or
+-- deleted job in the same transaction as the write, so no change is lost when
+-- a writer crashes. scripts/sync-algolia-incremental.ts pushes only those rows
+-- to Algolia and marks them synced, so index cost grows with changes, not table size.
+
+CREATE TABLE IF NOT EXISTS public.job_changes (
+  id BIGSERIAL PRIMARY KEY,
+  job_id UUID NOT NULL,
+  operation TEXT NOT NULL CHECK (operation IN ('insert', 'update', 'deactivate', 'delete')),
+  created_at TIMESTAMPTZ DEFAULT NOW(),
+  synced_at TIMESTAMPTZ
+);
+
+-- The sync only ever reads pending changes in order
+CREATE INDEX IF NOT EXISTS idx_job_changes_pending
+  ON public.job_changes(id)
+  WHERE synced_at IS NULL;
+
+-- Only the service role (sync script) reads the outbox
+ALTER TABLE public.job_changes ENABLE ROW LEVEL SECURITY;
+
+-- Runs as the owner so every writer of jobs can append to the outbox
+CREATE OR REPLACE FUNCTION public.record_job_change()
+RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    INSERT INTO public.job_changes (job_id, operation) VALUES (NEW.id, 'insert');
+  ELSIF TG_OP = 'DELETE' THEN
+    INSERT INTO public.job_changes (job_id, operation) VALUES (OLD.id, 'delete');
+  ELSIF COALESCE(OLD.is_active, FALSE) AND NOT COALESCE(NEW.is_active, FALSE) THEN
+    INSERT INTO public.job_changes (job_id, operation) VALUES (NEW.id, 'deactivate');
+  ELSE
+    INSERT INTO public.job_changes (job_id, operation) VALUES (NEW.id, 'update');
+  END IF;
+
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+DROP TRIGGER IF EXISTS record_job_insert_delete ON public.jobs;
+CREATE TRIGGER record_job_insert_delete
+  AFTER INSERT OR DELETE ON public.jobs
+  FOR EACH ROW
+  EXECUTE FUNCTION public.record_job_change();
+
+-- Skip updates that change nothing but updated_at (e.g. a re-parse that
+-- produced the same row), so they do not cost an index write
+DROP TRIGGER IF EXISTS record_job_update ON public.jobs;
+CREATE TRIGGER record_job_update
+  AFTER UPDATE ON public.jobs
+  FOR EACH ROW
+  WHEN (to_jsonb(OLD) - 'updated_at' IS DISTINCT FROM to_jsonb(NEW) - 'updated_at')
+  EXECUTE FUNCTION public.record_job_change();
+
+-- Drop synced changes after a week
+CREATE OR REPLACE FUNCTION cleanup_synced_job_changes()
+RETURNS INTEGER AS $$
+DECLARE
+  deleted_count INTEGER;
+BEGIN
+  DELETE FROM public.job_changes
+  WHERE synced_at IS NOT NULL
+    AND synced_at < NOW() - INTERVAL '7 days';
+
+  GET DIAGNOSTICS deleted_count = ROW_COUNT;
+  RETURN deleted_count;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON TABLE public.job_changes IS 'Outbox of changed job ids, filled by triggers on jobs and consumed by the incremental Algolia sync';
+COMMENT ON FUNCTION cleanup_synced_job_changes IS 'Removes synced job changes older than 7 days - schedule daily';